@@ -1,78 +1,307 @@
 #!/usr/bin/env python3
 """Test script for python-mcp-server stdio communication"""
 
+import collections
+import fcntl
 import json
-import subprocess
+import os
+import select
 import threading
-import queue
 import time
-import argparse
+import sys
+
+# fcntl.F_SETPIPE_SZ is Linux-only and missing before Python 3.10
+_F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+
+# Prefer orjson when available; fall back to the standard library
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
+
+# The test sequence never changes, so serialize its payloads once
+_INITIALIZE_PAYLOAD = _dumps({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "0.1.0",
+        "clientInfo": {
+            "name": "test-client",
+            "version": "1.0.0"
+        }
+    }
+})
+_INITIALIZED_PAYLOAD = _dumps({
+    "jsonrpc": "2.0",
+    "method": "initialized"
+})
+_LIST_REQUESTS = [
+    {
+        "jsonrpc": "2.0",
+        "id": 2,
+        "method": "tools/list",
+        "params": {}
+    },
+    {
+        "jsonrpc": "2.0",
+        "id": 3,
+        "method": "prompts/list",
+        "params": {}
+    },
+    {
+        "jsonrpc": "2.0",
+        "id": 4,
+        "method": "resources/list",
+        "params": {}
+    }
+]
+_LIST_BATCH_PAYLOAD = _dumps(_LIST_REQUESTS)
+# Used when the server does not support batches
+_LIST_PAYLOADS = {request["id"]: _dumps(request) for request in _LIST_REQUESTS}
+_SHUTDOWN_PAYLOAD = _dumps({
+    "jsonrpc": "2.0",
+    "id": 5,
+    "method": "shutdown",
+    "params": {}
+})
+
+def _print_json(header, obj, prefix, stream=None):
+    """Print header and obj pretty-printed with each line indented by prefix
+
+    The message is built as one string and written once, so a line-buffered
+    stdout is flushed once per message rather than once per line.
+    """
+    body = json.dumps(obj, indent=2).replace("\n", "\n" + prefix)
+    (stream or sys.stdout).write(f"{header}\n{prefix}{body}\n")
 
 class MCPServerTester:
     def __init__(self, pretty=False):
         self.process = None
-        self.output_queue = queue.Queue()
+        # Single producer (reader thread), single consumer (main thread):
+        # deque append/popleft are atomic, the event only signals wakeups
+        self.output_deque = collections.deque()
+        self.output_event = threading.Event()
         self.reader_thread = None
         self.pretty = pretty
+        # Responses that arrived while waiting for a different id
+        self.pending = {}
         
     def start_server(self):
         """Start the MCP server process"""
+        # Imported here so the tester can be imported without subprocess
+        import shutil
+        import subprocess
+
         print("Starting python-mcp-server...")
+        # close_fds=False skips closing every inherited fd in the child. This
+        # is safe here: the script opens no other descriptors worth hiding and
+        # Python's own fds are non-inheritable already. Together with a full
+        # executable path it lets subprocess use posix_spawn instead of fork.
         self.process = subprocess.Popen(
-            ['python-mcp-server'],
+            [shutil.which('python-mcp-server') or 'python-mcp-server'],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=0
+            bufsize=0,
+            close_fds=False
         )
+        self._stdin_fd = self.process.stdin.fileno()
+        # Grow the pipes so large tool output never stalls the server
+        for fd in (self._stdin_fd, self.process.stdout.fileno()):
+            try:
+                fcntl.fcntl(fd, _F_SETPIPE_SZ, 1 << 20)
+            except OSError:
+                pass
         
         # Start reader thread
         self.reader_thread = threading.Thread(target=self._read_output)
         self.reader_thread.daemon = True
         self.reader_thread.start()
         
-        # Give server time to start
-        time.sleep(0.5)
-        
+    def stop_server(self):
+        """Stop the server, escalating quickly to SIGTERM and then SIGKILL"""
+        import subprocess
+
+        # EOF on stdin lets a well-behaved server exit on its own
+        self.process.stdin.close()
+        try:
+            self.process.wait(timeout=0.2)
+        except subprocess.TimeoutExpired:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=0.1)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
     def _read_output(self):
         """Read output from server in background thread"""
-        while self.process and self.process.poll() is None:
+        fd = self.process.stdout.fileno()
+        buf = bytearray()
+        while True:
             try:
-                line = self.process.stdout.readline()
-                if line:
-                    self.output_queue.put(line.strip())
+                # Sleep in the kernel until output or EOF arrives; only check
+                # on the process when the wait times out
+                readable, _, _ = select.select([fd], [], [], 0.5)
+                if not readable:
+                    if self.process.poll() is not None:
+                        break
+                    continue
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                buf.extend(chunk)
+                # Split complete newline-delimited frames off the buffer
+                while True:
+                    end = buf.find(b'\n')
+                    if end < 0:
+                        break
+                    # Frames stay as bytes; the main thread decodes what it uses
+                    frame = bytes(buf[:end]).rstrip(b'\r')
+                    del buf[:end + 1]
+                    if frame:
+                        self.output_deque.append(frame)
+                        self.output_event.set()
             except:
                 break
+
+        # Keep a final line the server wrote without a trailing newline
+        frame = bytes(buf).rstrip(b'\r')
+        if frame:
+            self.output_deque.append(frame)
+            self.output_event.set()
                 
     def send_request(self, request):
-        """Send a JSON-RPC request to the server"""
-        request_str = json.dumps(request)
+        """Send a JSON-RPC request (dict or pre-serialized payload) to the server"""
+        if isinstance(request, str):
+            request_str = request
+            if self.pretty:
+                request = _loads(request)
+        else:
+            request_str = _dumps(request)
         if self.pretty:
-            print("  → Request:")
-            print("    " + json.dumps(request, indent=2).replace("\n", "\n    "))
+            _print_json("  → Request:", request, "    ")
         else:
             print(f"  → {request_str}")
-        self.process.stdin.write(request_str + '\n')
-        self.process.stdin.flush()
-        
-    def get_response(self, timeout=2):
-        """Get response from server with timeout"""
-        try:
-            response = self.output_queue.get(timeout=timeout)
+        # stdin is unbuffered: one writev submits the payload and its newline
+        os.writev(self._stdin_fd, (request_str.encode('utf-8'), b'\n'))
+
+    def send_batch(self, requests):
+        """Send several JSON-RPC requests (list or pre-serialized payload) as a single batch array"""
+        if isinstance(requests, str):
+            batch_str = requests
             if self.pretty:
-                try:
-                    response_obj = json.loads(response)
-                    print("  ← Response:")
-                    print("    " + json.dumps(response_obj, indent=2).replace("\n", "\n    "))
-                except json.JSONDecodeError:
-                    print(f"  ← {response}")
+                requests = _loads(requests)
+        else:
+            batch_str = _dumps(requests)
+        if self.pretty:
+            _print_json("  → Batch request:", requests, "    ")
+        else:
+            print(f"  → {batch_str}")
+        os.writev(self._stdin_fd, (batch_str.encode('utf-8'), b'\n'))
+        
+    def _next_frame(self, timeout):
+        """Pop the next raw frame from the output deque, or None on timeout"""
+        while not self.output_deque:
+            if not self.output_event.wait(timeout):
+                return None
+            self.output_event.clear()
+        return self.output_deque.popleft()
+
+    def get_response(self, expected_id, timeout=2):
+        """Get the response matching expected_id from server with timeout"""
+        if expected_id in self.pending:
+            return self._show_response(*self.pending.pop(expected_id))
+
+        deadline = time.monotonic() + timeout
+        while True:
+            frame = self._next_frame(max(0, deadline - time.monotonic()))
+            if frame is None:
+                print(f"  ← (no response within {timeout}s)")
+                return None
+            response = frame.decode('utf-8')
+            try:
+                response_obj = _loads(frame)
+            except json.JSONDecodeError:
+                # Not JSON-RPC (e.g. server log output), show it and keep waiting
+                print(f"  ← {response}")
+                continue
+            response_id = response_obj.get("id") if isinstance(response_obj, dict) else None
+            if response_id == expected_id:
+                return self._show_response(response, response_obj)
+            if response_id is None:
+                print(f"  ← {response}")
             else:
+                self.pending[response_id] = (response, response_obj)
+
+    def _show_response(self, response, response_obj):
+        """Print a response and return its raw text"""
+        if self.pretty:
+            _print_json("  ← Response:", response_obj, "    ")
+        else:
+            print(f"  ← {response}")
+        return response
+
+    def get_batch_response(self, ids, timeout=2):
+        """Get a batch response array for ids, keyed by request id
+
+        Returns None when the server does not answer with a complete batch
+        array, e.g. a single parse error when batches are unsupported or
+        individual responses. Any responses for ids that did arrive are kept
+        in pending, so only the missing ids need to be sent again.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if all(request_id in self.pending for request_id in ids):
+                # Every id was answered individually, nothing left to wait for
+                return None
+            frame = self._next_frame(max(0, deadline - time.monotonic()))
+            if frame is None:
+                print(f"  ← (no response within {timeout}s)")
+                return None
+            response = frame.decode('utf-8')
+            try:
+                responses = _loads(frame)
+            except json.JSONDecodeError:
+                # Not JSON-RPC (e.g. server log output), show it and keep waiting
                 print(f"  ← {response}")
-            return response
-        except queue.Empty:
-            print(f"  ← (no response within {timeout}s)")
+                continue
+            if isinstance(responses, list):
+                break
+            response_id = responses.get("id") if isinstance(responses, dict) else None
+            if response_id in ids:
+                # Answered individually; keep it for get_response
+                self.pending[response_id] = (response, responses)
+                continue
+            print(f"  ← (expected a batch of {len(ids)} responses) {response}")
+            return None
+
+        by_id = {}
+        for response_obj in responses:
+            response_id = response_obj.get("id") if isinstance(response_obj, dict) else None
+            if response_id in ids and response_id not in by_id:
+                by_id[response_id] = response_obj
+            else:
+                print(f"  ← (unexpected batch element) {_dumps(response_obj)}")
+        missing = [request_id for request_id in ids if request_id not in by_id]
+        if missing or len(responses) != len(ids):
+            print(f"  ← (batch of {len(responses)} is missing ids {missing})")
+            for response_id, response_obj in by_id.items():
+                self.pending[response_id] = (_dumps(response_obj), response_obj)
             return None
+
+        for response_id, response_obj in by_id.items():
+            if self.pretty:
+                _print_json(f"  ← Response (id {response_id}):", response_obj, "    ")
+            else:
+                print(f"  ← {_dumps(response_obj)}")
+        return by_id
             
     def run_tests(self):
         """Run test sequence"""
@@ -82,75 +311,36 @@ class MCPServerTester:
         
         # Test 1: Initialize
         print("Test 1: Initialize")
-        self.send_request({
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "0.1.0",
-                "clientInfo": {
-                    "name": "test-client",
-                    "version": "1.0.0"
-                }
-            }
-        })
-        self.get_response()
+        self.send_request(_INITIALIZE_PAYLOAD)
+        self.get_response(1)
         
         # Send initialized notification
         print("\nSending initialized notification")
-        self.send_request({
-            "jsonrpc": "2.0",
-            "method": "initialized"
-        })
-        time.sleep(0.5)  # Give time to process
-        
-        # Test 2: List tools
-        print("\nTest 2: List Tools")
-        self.send_request({
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "tools/list",
-            "params": {}
-        })
-        self.get_response()
-        
-        # Test 3: List prompts
-        print("\nTest 3: List Prompts")
-        self.send_request({
-            "jsonrpc": "2.0",
-            "id": 3,
-            "method": "prompts/list",
-            "params": {}
-        })
-        self.get_response()
+        self.send_request(_INITIALIZED_PAYLOAD)
         
-        # Test 4: List resources
-        print("\nTest 4: List Resources")
-        self.send_request({
-            "jsonrpc": "2.0",
-            "id": 4,
-            "method": "resources/list",
-            "params": {}
-        })
-        self.get_response()
+        # Tests 2-4: List tools, prompts and resources in one batch
+        print("\nTests 2-4: List Tools, Prompts and Resources (batched)")
+        self.send_batch(_LIST_BATCH_PAYLOAD)
+        if self.get_batch_response(list(_LIST_PAYLOADS)) is None:
+            print("\nNo complete batch response, sending missing list requests individually")
+            for request_id, payload in _LIST_PAYLOADS.items():
+                if request_id not in self.pending:
+                    self.send_request(payload)
+                self.get_response(request_id)
         
         # Clean up
         print("\nShutting down...")
-        self.send_request({
-            "jsonrpc": "2.0",
-            "id": 5,
-            "method": "shutdown",
-            "params": {}
-        })
-        time.sleep(0.5)
+        self.send_request(_SHUTDOWN_PAYLOAD)
+        self.get_response(5, timeout=0.5)
         
         if self.process:
-            self.process.terminate()
-            self.process.wait(timeout=2)
+            self.stop_server()
             
         print("\nTests completed!")
 
 if __name__ == "__main__":
+    import argparse
+
     parser = argparse.ArgumentParser(description="Test MCP server stdio communication")
     parser.add_argument('-p', '--pretty', action='store_true', 
                         help='Pretty-print JSON requests and responses')
@@ -162,8 +352,8 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("\nInterrupted by user")
         if tester.process:
-            tester.process.terminate()
+            tester.stop_server()
     except Exception as e:
         print(f"\nError: {e}")
         if tester.process:
-            tester.process.terminate()
+            tester.stop_server()
@@ -1,104 +1,266 @@
 #!/usr/bin/env python3
 """Test script for executing Python code via MCP server"""
 
+import collections
+import concurrent.futures
+import fcntl
+import io
 import json
-import subprocess
+import os
+import re
+import select
 import threading
-import queue
 import time
-import argparse
 import sys
 
+# fcntl.F_SETPIPE_SZ is Linux-only and missing before Python 3.10
+_F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+
+# Matches the JSON-RPC id; the server writes it ahead of the result body
+_ID_RE = re.compile(rb'"id"\s*:\s*(-?\d+)')
+# Start of the message body; an "id" after this belongs to nested data
+_BODY_RE = re.compile(rb'"(?:result|error|params)"\s*:')
+
+# Prefer orjson when available; fall back to the standard library
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
+
+# The initialized notification carries no id, so it can be serialized once
+_INITIALIZED_PAYLOAD = _dumps({
+    "jsonrpc": "2.0",
+    "method": "initialized"
+})
+
+def _daemon_socket_path():
+    """Unix socket a --daemon tester listens on, in a directory private to this user"""
+    # Imported here so the tester can be imported without the daemon's modules
+    import stat
+    import tempfile
+
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        # The temp dir is shared; use a per-user subdirectory nobody else can enter
+        runtime_dir = os.path.join(tempfile.gettempdir(), f"python-mcp-tester-{os.getuid()}")
+        os.makedirs(runtime_dir, mode=0o700, exist_ok=True)
+        info = os.lstat(runtime_dir)
+        if (not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid()
+                or info.st_mode & 0o077):
+            raise RuntimeError(f"{runtime_dir} is not a private directory owned by this user")
+    return os.path.join(runtime_dir, "python-mcp-tester.sock")
+
+def _print_json(header, obj, prefix, stream=None):
+    """Print header and obj pretty-printed with each line indented by prefix
+
+    The message is built as one string and written once, so a line-buffered
+    stdout is flushed once per message rather than once per line.
+    """
+    body = json.dumps(obj, indent=2).replace("\n", "\n" + prefix)
+    (stream or sys.stdout).write(f"{header}\n{prefix}{body}\n")
+
 class PythonMCPTester:
-    def __init__(self, pretty=False):
+    def __init__(self, pretty=False, out=None):
         self.process = None
-        self.output_queue = queue.Queue()
+        # Single producer (reader thread), single consumer (main thread):
+        # deque append/popleft are atomic, the event only signals wakeups
+        self.output_deque = collections.deque()
+        self.output_event = threading.Event()
         self.reader_thread = None
         self.pretty = pretty
+        # Stream for progress output; None means sys.stdout
+        self.out = out
         self.initialized = False
         self.request_id = 0
+        # Raw responses that arrived while waiting for a different id
+        self.pending = {}
+        # Messages without an id (server notifications)
+        self.notifications = []
+        # Connection to a --daemon tester, when one is in use
+        self.daemon = None
+        self._daemon_reader = None
+        # When serving as a --daemon: clients get their own threads, so
+        # executions on the one server are serialized by this lock
+        self._daemon_lock = threading.Lock()
+        # Exception that left the daemon's server unusable, if any
+        self._daemon_failure = None
         
     def start_server(self):
         """Start the MCP server process"""
-        print("Starting python-mcp-server...")
+        if self.daemon:
+            return
+
+        # Imported here so the tester can be imported without subprocess
+        import shutil
+        import subprocess
+
+        print("Starting python-mcp-server...", file=self.out)
+        # close_fds=False skips closing every inherited fd in the child. This
+        # is safe here: the script opens no other descriptors worth hiding and
+        # Python's own fds are non-inheritable already. Together with a full
+        # executable path it lets subprocess use posix_spawn instead of fork.
         self.process = subprocess.Popen(
-            ['python-mcp-server'],
+            [shutil.which('python-mcp-server') or 'python-mcp-server'],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=0
+            bufsize=0,
+            close_fds=False
         )
+        self._stdin_fd = self.process.stdin.fileno()
+        # Grow the pipes so large tool output never stalls the server
+        for fd in (self._stdin_fd, self.process.stdout.fileno()):
+            try:
+                fcntl.fcntl(fd, _F_SETPIPE_SZ, 1 << 20)
+            except OSError:
+                pass
         
         # Start reader thread
         self.reader_thread = threading.Thread(target=self._read_output)
         self.reader_thread.daemon = True
         self.reader_thread.start()
         
-        # Give server time to start
-        time.sleep(0.5)
-        
+    def stop_server(self):
+        """Stop the server, escalating quickly to SIGTERM and then SIGKILL"""
+        import subprocess
+
+        # EOF on stdin lets a well-behaved server exit on its own
+        self.process.stdin.close()
+        try:
+            self.process.wait(timeout=0.2)
+        except subprocess.TimeoutExpired:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=0.1)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
     def _read_output(self):
         """Read output from server in background thread"""
-        while self.process and self.process.poll() is None:
+        fd = self.process.stdout.fileno()
+        buf = bytearray()
+        while True:
             try:
-                line = self.process.stdout.readline()
-                if line:
-                    self.output_queue.put(line.strip())
+                # Sleep in the kernel until output or EOF arrives; only check
+                # on the process when the wait times out
+                readable, _, _ = select.select([fd], [], [], 0.5)
+                if not readable:
+                    if self.process.poll() is not None:
+                        break
+                    continue
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                buf.extend(chunk)
+                # Split complete newline-delimited frames off the buffer
+                while True:
+                    end = buf.find(b'\n')
+                    if end < 0:
+                        break
+                    # Frames stay as bytes; the main thread decodes what it uses
+                    frame = bytes(buf[:end]).rstrip(b'\r')
+                    del buf[:end + 1]
+                    if frame:
+                        self.output_deque.append(frame)
+                        self.output_event.set()
             except:
                 break
-                
-    def clear_queue(self):
-        """Clear any pending messages in the output queue"""
-        while not self.output_queue.empty():
-            try:
-                self.output_queue.get_nowait()
-            except queue.Empty:
-                break
 
+        # Keep a final line the server wrote without a trailing newline
+        frame = bytes(buf).rstrip(b'\r')
+        if frame:
+            self.output_deque.append(frame)
+            self.output_event.set()
+                
     def send_request(self, request):
-        """Send a JSON-RPC request to the server"""
-        # Clear any pending responses before sending new request
-        self.clear_queue()
-
-        request_str = json.dumps(request)
+        """Send a JSON-RPC request (dict or pre-serialized payload) to the server"""
+        if isinstance(request, str):
+            request_str = request
+            if self.pretty:
+                request = _loads(request)
+        else:
+            request_str = _dumps(request)
         if self.pretty:
-            print("\n→ Request:")
-            print("  " + json.dumps(request, indent=2).replace("\n", "\n  "))
+            _print_json("\n→ Request:", request, "  ", self.out)
         else:
-            print(f"\n→ {request_str}")
-        self.process.stdin.write(request_str + '\n')
-        self.process.stdin.flush()
+            print(f"\n→ {request_str}", file=self.out)
+        # stdin is unbuffered: one writev submits the payload and its newline
+        os.writev(self._stdin_fd, (request_str.encode('utf-8'), b'\n'))
         
-    def get_response(self, timeout=10):
-        """Get response from server with timeout"""
-        try:
-            response = self.output_queue.get(timeout=timeout)
-            if self.pretty:
-                try:
-                    response_obj = json.loads(response)
-                    print("\n← Response:")
-                    print("  " + json.dumps(response_obj, indent=2).replace("\n", "\n  "))
-                    return response_obj
-                except json.JSONDecodeError:
-                    print(f"\n← {response}")
-                    return response
+    def _next_frame(self, timeout):
+        """Pop the next raw frame from the output deque, or None on timeout"""
+        while not self.output_deque:
+            if not self.output_event.wait(timeout):
+                return None
+            self.output_event.clear()
+        return self.output_deque.popleft()
+
+    def get_response(self, expected_id, timeout=10, parse=False):
+        """Get the response matching expected_id from server with timeout
+
+        Responses are matched by scanning the raw frame for its id. The body
+        is only parsed when parse is set (or for pretty-printing); otherwise
+        the raw frame is returned.
+        """
+        if expected_id in self.pending:
+            return self._show_response(self.pending.pop(expected_id), parse)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            frame = self._next_frame(max(0, deadline - time.monotonic()))
+            if frame is None:
+                print(f"\n← (no response within {timeout}s)", file=self.out)
+                return None
+            match = None
+            if frame.startswith(b'{'):
+                body = _BODY_RE.search(frame)
+                match = _ID_RE.search(frame, 0, body.start() if body else len(frame))
+            if match is not None:
+                response_id = int(match.group(1))
             else:
-                print(f"\n← {response}")
+                # No leading id: parse to tell responses, notifications and
+                # non-JSON output apart
                 try:
-                    return json.loads(response)
-                except:
-                    return response
-        except queue.Empty:
-            print(f"\n← (no response within {timeout}s)")
-            return None
+                    message = _loads(frame)
+                except json.JSONDecodeError:
+                    # Not JSON-RPC (e.g. server log output), show it and keep waiting
+                    print(f"\n← {frame.decode('utf-8', errors='replace')}", file=self.out)
+                    continue
+                response_id = message.get("id") if isinstance(message, dict) else None
+                if response_id is None:
+                    self.notifications.append(message)
+                    continue
+            if response_id == expected_id:
+                return self._show_response(frame, parse)
+            self.pending[response_id] = frame
+
+    def _show_response(self, frame, parse):
+        """Print a raw response and return it, parsed if requested"""
+        if self.pretty or parse:
+            try:
+                response_obj = _loads(frame)
+            except json.JSONDecodeError:
+                response = frame.decode('utf-8', errors='replace')
+                print(f"\n← {response}", file=self.out)
+                return response
+        if self.pretty:
+            _print_json("\n← Response:", response_obj, "  ", self.out)
+        else:
+            print(f"\n← {frame.decode('utf-8')}", file=self.out)
+        return response_obj if parse else frame
             
     def initialize(self):
         """Initialize the MCP connection"""
-        if self.initialized:
+        if self.initialized or self.daemon:
             return True
             
-        print("\n=== Initializing MCP Server ===")
+        print("\n=== Initializing MCP Server ===", file=self.out)
         
         # Send initialize request
         self.request_id += 1
@@ -115,31 +277,23 @@ class PythonMCPTester:
             }
         })
         
-        response = self.get_response()
+        response = self.get_response(self.request_id)
         if not response:
-            print("Failed to initialize server")
+            print("Failed to initialize server", file=self.out)
             return False
             
         # Send initialized notification
-        self.send_request({
-            "jsonrpc": "2.0",
-            "method": "initialized"
-        })
-        time.sleep(0.5)
+        self.send_request(_INITIALIZED_PAYLOAD)
         
         self.initialized = True
         return True
         
-    def execute_python(self, code, modules=None):
-        """Execute Python code through the MCP server"""
-        if not self.initialized:
-            if not self.initialize():
-                return None
-                
-        print(f"\n=== Executing Python Code ===")
+    def send_execute_python(self, code, modules=None):
+        """Send an execute-python tool call without waiting for the result"""
+        header = "\n=== Executing Python Code ===\n"
         if modules:
-            print(f"Modules to install: {modules}")
-        print(f"Code:\n{code}\n")
+            header += f"Modules to install: {modules}\n"
+        print(f"{header}Code:\n{code}\n", file=self.out)
         
         # Increment request ID for each call
         self.request_id += 1
@@ -160,8 +314,11 @@ class PythonMCPTester:
             "method": "tools/call",
             "params": params
         })
-        
-        response = self.get_response(timeout=30)  # Longer timeout for code execution
+        return self.request_id
+
+    def receive_execution_result(self, request_id):
+        """Wait for the result of an execute-python call and print it"""
+        response = self.get_response(request_id, timeout=30, parse=True)  # Longer timeout for code execution
         
         if response and isinstance(response, dict):
             if "result" in response:
@@ -170,28 +327,176 @@ class PythonMCPTester:
                     content = result["content"]
                     if isinstance(content, list) and len(content) > 0:
                         text_content = content[0].get("text", "")
-                        print("\n=== Execution Result ===")
-                        print(text_content)
-                        # Wait a bit to ensure output is complete
-                        time.sleep(0.5)
+                        print(f"\n=== Execution Result ===\n{text_content}", file=self.out)
                         return text_content
                         
         return response
-        
-    def run_examples(self):
-        """Run example Python code executions"""
+
+    def execute_python(self, code, modules=None):
+        """Execute Python code through the MCP server"""
+        if self.daemon:
+            return self._execute_via_daemon(code, modules)
+        if not self.initialized:
+            if not self.initialize():
+                return None
+
+        request_id = self.send_execute_python(code, modules)
+        return self.receive_execution_result(request_id)
+
+    def connect_daemon(self):
+        """Connect to a running --daemon tester, returning True on success"""
+        # Imported here so the tester can be imported without socket
+        import socket
+
+        try:
+            path = _daemon_socket_path()
+            owner = os.stat(path).st_uid
+        except RuntimeError as e:
+            print(f"Not using a tester daemon: {e}", file=self.out)
+            return False
+        except OSError:
+            return False
+        # Someone else's socket would receive our code and could fake the output
+        if owner != os.getuid():
+            print(f"Not using a tester daemon: {path} is owned by another user", file=self.out)
+            return False
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(path)
+        except OSError:
+            sock.close()
+            return False
+        print(f"Using tester daemon at {path}", file=self.out)
+        self.daemon = sock
+        self._daemon_reader = sock.makefile('rb')
+        return True
+
+    def _execute_via_daemon(self, code, modules):
+        """Forward an execution to the daemon and print its output"""
+        request = _dumps({"code": code, "modules": modules, "pretty": self.pretty})
+        self.daemon.sendall(request.encode('utf-8') + b'\n')
+        line = self._daemon_reader.readline()
+        if not line:
+            print("\nTester daemon closed the connection", file=self.out)
+            return None
+        reply = _loads(line)
+        if "error" in reply:
+            print(f"\nTester daemon error: {reply['error']}", file=self.out)
+            return None
+        print(reply["output"], end="", file=self.out)
+        return reply["result"]
+
+    def run_daemon(self):
+        """Keep one warm server and serve executions over a Unix socket"""
+        # Imported here so the tester can be imported without socket
+        import socket
+
+        path = _daemon_socket_path()
+        if self.connect_daemon():
+            print("A tester daemon is already running", file=self.out)
+            return
+        # Nobody is listening, so any existing socket file is stale
+        if os.path.exists(path):
+            os.unlink(path)
+
         self.start_server()
-        
-        # Initialize once at the beginning
         if not self.initialize():
-            print("Failed to initialize server")
+            print("Failed to initialize server", file=self.out)
             return
 
-        # Example 1: Simple calculation
-        print("\n" + "="*60)
-        print("Example 1: Simple Calculation")
-        print("="*60)
-        self.execute_python("""
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        # The daemon runs arbitrary code for whoever connects; keep it private
+        os.chmod(path, 0o600)
+        listener.listen()
+        print(f"\n=== Serving on {path} (Ctrl+C to stop) ===", file=self.out)
+        # Wake up periodically to notice a server failure seen by a client thread
+        listener.settimeout(0.5)
+        try:
+            while self._daemon_failure is None:
+                try:
+                    conn, _ = listener.accept()
+                except socket.timeout:
+                    continue
+                conn.settimeout(None)
+                threading.Thread(
+                    target=self._serve_daemon_client, args=(conn,), daemon=True
+                ).start()
+            raise RuntimeError(f"MCP server failed: {self._daemon_failure}")
+        finally:
+            listener.close()
+            os.unlink(path)
+
+    def _serve_daemon_client(self, conn):
+        """Serve one daemon client until it disconnects"""
+        with conn, conn.makefile('rb') as reader:
+            try:
+                for line in reader:
+                    self._serve_daemon_request(conn, line)
+            except OSError:
+                # Client went away; keep serving others
+                pass
+
+    def _serve_daemon_request(self, conn, line):
+        """Run one execution for a daemon client and send back its output"""
+        try:
+            request = _loads(line)
+        except json.JSONDecodeError:
+            request = None
+        if not isinstance(request, dict) or not isinstance(request.get("code"), str):
+            self._send_daemon_reply(conn, {"error": "expected a JSON object with a \"code\" string"})
+            return
+
+        with self._daemon_lock:
+            if self._daemon_failure is not None:
+                self._send_daemon_reply(conn, {"error": f"MCP server failed: {self._daemon_failure}"})
+                return
+            # Capture the execution output to send back to the client,
+            # formatted the way the client asked for
+            out, self.out = self.out, io.StringIO()
+            pretty, self.pretty = self.pretty, bool(request.get("pretty", self.pretty))
+            try:
+                result = self.execute_python(request["code"], request.get("modules"))
+                output = self.out.getvalue()
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"server exited with code {self.process.returncode}")
+            except Exception as e:
+                # The shared server is unusable; stop the daemon
+                self._daemon_failure = e
+                self._send_daemon_reply(conn, {"error": f"MCP server failed: {e}"})
+                return
+            finally:
+                self.out = out
+                self.pretty = pretty
+        self._send_daemon_reply(conn, {"output": output, "result": result})
+
+    def _send_daemon_reply(self, conn, reply):
+        """Send one JSON line back to a daemon client"""
+        conn.sendall(_dumps(reply).encode('utf-8') + b'\n')
+
+    def execute_python_batch(self, jobs):
+        """Execute several (label, code, modules) jobs, sending all before waiting on any"""
+        if not self.initialized:
+            if not self.initialize():
+                return None
+
+        request_ids = []
+        for label, code, modules in jobs:
+            print("\n" + "="*60 + f"\n{label}\n" + "="*60, file=self.out)
+            request_ids.append(self.send_execute_python(code, modules))
+
+        # Responses are matched by id, so print them in submission order
+        results = []
+        for (label, _, _), request_id in zip(jobs, request_ids):
+            print("\n" + "="*60 + f"\n{label} - Result\n" + "="*60, file=self.out)
+            results.append(self.receive_execution_result(request_id))
+        return results
+        
+    def run_examples(self):
+        """Run example Python code executions, each on its own server"""
+        examples = [
+            ("Simple Calculation", """
 # Calculate factorial
 def factorial(n):
     if n <= 1:
@@ -211,16 +516,8 @@ def fibonacci(n):
     return fib_sequence
 
 print(f"First 10 Fibonacci numbers: {fibonacci(10)}")
-""")
-        
-        # Wait between tests to avoid interleaving
-        time.sleep(1)
-
-        # Example 2: Working with data structures
-        print("\n" + "="*60)
-        print("Example 2: Data Processing")
-        print("="*60)
-        self.execute_python("""
+""", None),
+            ("Data Processing", """
 import json
 import statistics
 
@@ -247,16 +544,8 @@ name_lengths = {name: len(name) for name in data["names"]}
 print(f"\\nName analysis:")
 print(f"  Sorted: {sorted_names}")
 print(f"  Lengths: {json.dumps(name_lengths, indent=2)}")
-""")
-        
-        # Wait between tests to avoid interleaving
-        time.sleep(1)
-
-        # Example 3: Using external modules
-        print("\n" + "="*60)
-        print("Example 3: Using External Modules (pandas)")
-        print("="*60)
-        self.execute_python("""
+""", None),
+            ("Using External Modules (pandas)", """
 import pandas as pd
 import numpy as np
 
@@ -274,16 +563,8 @@ print(f"\\nColumn means:")
 print(df.mean())
 print(f"\\nDataFrame info:")
 df.info()
-""", modules="pandas,numpy")
-        
-        # Wait between tests to avoid interleaving
-        time.sleep(1)
-
-        # Example 4: Error handling
-        print("\n" + "="*60)
-        print("Example 4: Error Handling")
-        print("="*60)
-        self.execute_python("""
+""", "pandas,numpy"),
+            ("Error Handling", """
 # This will cause an error
 try:
     result = 10 / 0
@@ -292,26 +573,49 @@ except ZeroDivisionError as e:
     
 # Undefined variable error (will not be caught)
 print(undefined_variable)
-""")
+""", None),
+        ]
+
+        def run_example(label, code, modules):
+            # Buffer each example's output so the results print in order
+            tester = PythonMCPTester(pretty=self.pretty, out=io.StringIO())
+            try:
+                tester.start_server()
+                tester.execute_python_batch([(label, code, modules)])
+            finally:
+                tester.cleanup()
+            return tester.out.getvalue()
+
+        # The examples are independent, so run them concurrently
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(examples)) as executor:
+            futures = [
+                executor.submit(run_example, f"Example {number}: {title}", code, modules)
+                for number, (title, code, modules) in enumerate(examples, 1)
+            ]
+            for future in futures:
+                print(future.result(), end="", file=self.out)
         
     def run_interactive(self):
         """Run in interactive mode"""
         self.start_server()
         
         if not self.initialize():
-            print("Failed to initialize server")
+            print("Failed to initialize server", file=self.out)
             return
             
-        print("\n=== Interactive Python Execution Mode ===")
-        print("Enter Python code (use 'EOF' on a single line to execute)")
-        print("Use 'MODULES: module1,module2' to specify modules to install")
-        print("Type 'EXIT' to quit\n")
+        print(
+            "\n=== Interactive Python Execution Mode ===\n"
+            "Enter Python code (use 'EOF' on a single line to execute)\n"
+            "Use 'MODULES: module1,module2' to specify modules to install\n"
+            "Type 'EXIT' to quit\n",
+            file=self.out
+        )
         
         while True:
             modules = None
-            code_lines = []
+            code_buffer = io.StringIO()
             
-            print("\n>>> Enter code (EOF to execute, EXIT to quit):")
+            print("\n>>> Enter code (EOF to execute, EXIT to quit):", file=self.out)
             
             while True:
                 try:
@@ -324,18 +628,24 @@ print(undefined_variable)
                     elif line.startswith("MODULES:"):
                         modules = line[8:].strip()
                     else:
-                        code_lines.append(line)
+                        code_buffer.write(line)
+                        code_buffer.write("\n")
                 except EOFError:
                     break
                     
-            if code_lines:
-                code = "\n".join(code_lines)
+            if code_buffer.tell():
+                # Drop the newline written after the last line
+                code = code_buffer.getvalue()[:-1]
                 self.execute_python(code, modules)
                 
     def cleanup(self):
         """Clean up and shutdown"""
-        if self.initialized:
-            print("\n=== Shutting down ===")
+        if self.daemon:
+            self._daemon_reader.close()
+            self.daemon.close()
+
+        if self.initialized and self.process.poll() is None:
+            print("\n=== Shutting down ===", file=self.out)
             self.request_id += 1
             self.send_request({
                 "jsonrpc": "2.0",
@@ -343,13 +653,14 @@ print(undefined_variable)
                 "method": "shutdown",
                 "params": {}
             })
-            time.sleep(0.5)
+            self.get_response(self.request_id, timeout=0.5)
             
         if self.process:
-            self.process.terminate()
-            self.process.wait(timeout=2)
+            self.stop_server()
 
 if __name__ == "__main__":
+    import argparse
+
     parser = argparse.ArgumentParser(description="Test Python code execution via MCP server")
     parser.add_argument('-p', '--pretty', action='store_true', 
                         help='Pretty-print JSON requests and responses')
@@ -359,12 +670,21 @@ if __name__ == "__main__":
                         help='Execute specific Python code')
     parser.add_argument('-m', '--modules', type=str,
                         help='Comma-separated list of modules to install')
+    parser.add_argument('-d', '--daemon', action='store_true',
+                        help='Keep a warm server and serve --code/--interactive runs')
     args = parser.parse_args()
     
     tester = PythonMCPTester(pretty=args.pretty)
     
     try:
-        if args.code:
+        if not args.daemon and (args.code or args.interactive):
+            # Reuse a warm server from a running daemon when there is one
+            tester.connect_daemon()
+
+        if args.daemon:
+            # Serve other invocations until interrupted
+            tester.run_daemon()
+        elif args.code:
             # Execute specific code
             tester.start_server()
             tester.execute_python(args.code, args.modules)